@@ -7,9 +7,11 @@ setup(
     packages=find_packages(),
     install_requires=[
         "httpx",
+        "h2",
+        "ijson>=3.4",
+        "orjson>=3.10.7",
         "rich",
         "typer",
-        "pygithub",
     ],
     python_requires=">=3.8",
 ) 
\ No newline at end of file
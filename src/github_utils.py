@@ -3,12 +3,23 @@
 GitHub utilities for creating issues and setting outputs
 """
 
+import hashlib
+import json
 import os
+import tempfile
+import time
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-import github
+import httpx
 from rich.console import Console
 
+# orjson is optional; fall back to compact stdlib json when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize console for rich output
 console = Console()
 
@@ -16,6 +27,81 @@ console = Console()
 JsonDict = Dict[str, Any]
 Monitor = Dict[str, Any]
 
+# GitHub Actions environment, read once at import
+_IN_GHA = os.environ.get("GITHUB_ACTIONS") == "true"
+_GH_OUTPUT = os.environ.get("GITHUB_OUTPUT")
+_GH_REPO = os.environ.get("GITHUB_REPOSITORY", "")
+_DEF_OWNER, _DEF_REPO = _GH_REPO.split("/", 1) if "/" in _GH_REPO else (None, None)
+
+# Cache of issues already filed per monitor, to skip GitHub on unchanged runs
+ISSUE_CACHE_PATH = (
+    Path(os.environ.get("RUNNER_TEMP", tempfile.gettempdir())) / "sumo-issue-cache.json"
+)
+
+# Seconds a cached issue is trusted before GitHub is checked again, so an
+# issue closed in the meantime does not suppress a new one for long
+ISSUE_CACHE_TTL = 24 * 60 * 60
+
+# Write buffer size for the GitHub output file
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+# Labels applied to, and used to look up, monitor tag issues
+ISSUE_LABELS = ["sumo-logic", "monitor-tags", "automated"]
+
+# GitHub REST and GraphQL API base URL
+GITHUB_API_URL = "https://api.github.com"
+
+# GraphQL query for open monitor tag issues, paginated by cursor
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $labels: [String!], $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(states: OPEN, labels: $labels, first: 100, after: $cursor) {
+      nodes { number title url }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+# Issue templates for non-compliant monitors
+ISSUE_TITLE_TEMPLATE = "Non-compliant tags found in Sumo Logic monitor: {name}"
+
+ISSUE_BODY_TEMPLATE = """
+## Monitor Tag Violation
+
+A Sumo Logic monitor has been found with non-compliant tags.
+
+### Monitor Details
+- **Name**: {name}
+- **ID**: {id}
+- **URL**: {url}
+
+### Non-compliant Tags
+The following tags are not on the allowlist:
+{non_compliant_display}
+
+### Compliant Tags
+The following tags on this monitor are compliant:
+{compliant_display}
+
+Please update the monitor to use only approved tags.
+"""
+
+
+def to_json(value: Any) -> str:
+    """
+    Serialize a value to compact JSON for GitHub Actions outputs
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
 
 def set_github_output(results: Dict[str, Any]) -> None:
     """
@@ -25,14 +111,14 @@ def set_github_output(results: Dict[str, Any]) -> None:
         results: Dictionary of results to set as outputs
     """
     # Check if running in GitHub Actions
-    if os.environ.get("GITHUB_ACTIONS") != "true":
+    if not _IN_GHA:
         console.print(
             "[yellow]Not running in GitHub Actions, skipping output setting[/]"
         )
         return
 
     # Get GitHub output file path
-    output_file = os.environ.get("GITHUB_OUTPUT")
+    output_file = _GH_OUTPUT
     if not output_file:
         console.print(
             "[yellow]GITHUB_OUTPUT environment variable not set, using default mechanism[/]"
@@ -43,15 +129,106 @@ def set_github_output(results: Dict[str, Any]) -> None:
             print(f"::set-output name={key}::{value}")
         return
 
-    # Write to GitHub output file
-    with open(output_file, "a") as f:
-        for key, value in results.items():
-            value_str = str(value)
-            # Properly escape multiline values
-            if "\n" in value_str:
-                f.write(f"{key}<<EOF\n{value_str}\nEOF\n")
-            else:
-                f.write(f"{key}={value_str}\n")
+    # Encode the whole payload so it is written to GitHub output file at once
+    payload = bytearray()
+    for key, value in results.items():
+        value_str = value if isinstance(value, str) else str(value)
+        # Properly escape multiline values
+        if "\n" in value_str:
+            payload += f"{key}<<EOF\n{value_str}\nEOF\n".encode("utf-8")
+        else:
+            payload += f"{key}={value_str}\n".encode("utf-8")
+
+    with open(output_file, "ab", buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(payload)
+
+
+def _format_tags(tags: List[str]) -> str:
+    """Format tags as a comma-separated list of inline code spans"""
+    return ", ".join(f"`{tag}`" for tag in tags)
+
+
+def _github_client(github_token: str) -> httpx.AsyncClient:
+    """Create an HTTP/2 client for the GitHub API"""
+    return httpx.AsyncClient(
+        base_url=GITHUB_API_URL,
+        headers={
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github+json",
+        },
+        timeout=30.0,
+        http2=True,
+    )
+
+
+async def _fetch_open_issues(
+    client: httpx.AsyncClient, repo_owner: str, repo_name: str
+) -> Dict[str, JsonDict]:
+    """
+    Fetch open monitor tag issues with one GraphQL query per 100 issues
+
+    Args:
+        client: GitHub API client
+        repo_owner: GitHub repository owner
+        repo_name: GitHub repository name
+
+    Returns:
+        Issues with number, title and url, keyed by title
+    """
+    issues: Dict[str, JsonDict] = {}
+    variables = {"owner": repo_owner, "name": repo_name, "labels": ISSUE_LABELS}
+
+    while True:
+        response = await client.post(
+            "/graphql", json={"query": ISSUES_QUERY, "variables": variables}
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("errors"):
+            raise httpx.HTTPError(data["errors"][0].get("message", "GraphQL error"))
+
+        page = data["data"]["repository"]["issues"]
+        for node in page["nodes"]:
+            issues[node["title"]] = node
+
+        if not page["pageInfo"]["hasNextPage"]:
+            return issues
+        variables["cursor"] = page["pageInfo"]["endCursor"]
+
+
+def _issue_body(monitor: Monitor) -> str:
+    """Render the issue body for a non-compliant monitor"""
+    compliant_tags = monitor["compliant_tags"]
+    return ISSUE_BODY_TEMPLATE.format(
+        **monitor,
+        non_compliant_display=_format_tags(monitor["non_compliant_tags"]),
+        compliant_display=_format_tags(compliant_tags) if compliant_tags else "None",
+    )
+
+
+def _issue_fingerprint(monitor: Monitor, repo_owner: str, repo_name: str) -> str:
+    """Fingerprint a monitor's violations for the issue cache"""
+    key = f"{repo_owner}/{repo_name}|{monitor['id']}|{sorted(monitor['non_compliant_tags'])}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _load_issue_cache() -> Dict[str, Any]:
+    """Load the issue cache, treating an unreadable or malformed file as empty"""
+    try:
+        cache = json.loads(ISSUE_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_issue_cache(cache: Dict[str, Any]) -> None:
+    """Atomically replace the issue cache file"""
+    tmp_path = ISSUE_CACHE_PATH.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(to_json(cache))
+        tmp_path.replace(ISSUE_CACHE_PATH)
+    except OSError as e:
+        console.print(f"[yellow]Warning:[/] Could not write issue cache: {e}")
 
 
 async def create_github_issues(
@@ -73,111 +250,121 @@ async def create_github_issues(
         List of created issues
     """
     # Determine repository from environment if not provided
-    if not (repo_owner and repo_name) and os.environ.get("GITHUB_REPOSITORY"):
-        github_repo = os.environ.get("GITHUB_REPOSITORY", "")
-        if "/" in github_repo:
-            repo_owner, repo_name = github_repo.split("/", 1)
+    if not (repo_owner and repo_name):
+        repo_owner, repo_name = _DEF_OWNER, _DEF_REPO
 
     # Validate repository information
     if not repo_owner or not repo_name:
         console.print("[bold red]Error:[/] Repository information not available")
         return []
 
-    # Create PyGithub instance
-    g = github.Github(github_token)
-
-    # Get repository
-    try:
-        repo = g.get_repo(f"{repo_owner}/{repo_name}")
-    except github.GithubException as e:
-        console.print(f"[bold red]Error:[/] Failed to access repository: {e}")
-        return []
-
-    # Create issues for each non-compliant monitor
+    # Skip GitHub entirely for monitors whose issue was cached recently with
+    # the same violations
+    now = time.time()
+    loaded_cache = _load_issue_cache()
+    fingerprints = {
+        monitor["id"]: _issue_fingerprint(monitor, repo_owner, repo_name)
+        for monitor in monitors
+    }
+    cached_entries = {
+        monitor_id: entry
+        for monitor_id, entry in loaded_cache.items()
+        if entry.get("fingerprint") == fingerprints.get(monitor_id)
+        and now - entry.get("cached_at", 0) < ISSUE_CACHE_TTL
+    }
+
+    # Only monitors recorded in this run are kept, so monitors that were
+    # fixed since drop out of the cache and get a new issue if they regress
+    cache: Dict[str, Any] = {}
     created_issues = []
+    pending: Dict[str, List[Monitor]] = {}
+
+    def record(
+        issue: JsonDict, monitor: Monitor, status: str, cached_at: float = now
+    ) -> None:
+        cache[monitor["id"]] = {
+            "fingerprint": fingerprints[monitor["id"]],
+            "issue": issue,
+            "cached_at": cached_at,
+        }
+        created_issues.append(
+            {
+                **issue,
+                "monitor_id": monitor["id"],
+                "monitor_name": monitor["name"],
+                "status": status,
+            }
+        )
 
-    for monitor in monitors:
-        # Create issue title
-        title = f"Non-compliant tags found in Sumo Logic monitor: {monitor['name']}"
-
-        # Format compliant tags display string
-        compliant_tags = monitor["compliant_tags"]
-
-        def format_tag(tag):
-            return f"`{tag}`"
-
-        formatted_tags = [format_tag(tag) for tag in compliant_tags]
-        compliant_tags_display = ", ".join(formatted_tags) if compliant_tags else "None"
-
-        # Create issue body using template
-        body = f"""
-## Monitor Tag Violation
-
-A Sumo Logic monitor has been found with non-compliant tags.
-
-### Monitor Details
-- **Name**: {monitor['name']}
-- **ID**: {monitor['id']}
-- **URL**: {monitor['url']}
-
-### Non-compliant Tags
-The following tags are not on the allowlist:
-{', '.join([f'`{tag}`' for tag in monitor['non_compliant_tags']])}
-
-### Compliant Tags
-The following tags on this monitor are compliant:
-{compliant_tags_display}
-
-Please update the monitor to use only approved tags.
-"""
-
-        # Create labels
-        labels = ["sumo-logic", "monitor-tags", "automated"]
+    if len(cached_entries) == len(fingerprints):
+        for monitor in monitors:
+            entry = cached_entries[monitor["id"]]
+            record(entry["issue"], monitor, "existing", entry["cached_at"])
+        if cache != loaded_cache:
+            _save_issue_cache(cache)
+        return created_issues
 
+    async with _github_client(github_token) as client:
+        # Fetch open issues once and index them by title for duplicate checks
         try:
-            # Check if issue already exists
-            existing_issues = list(repo.get_issues(state="open", labels=labels))
-            duplicate_issue = False
+            existing_issues = await _fetch_open_issues(client, repo_owner, repo_name)
+        except httpx.HTTPError as e:
+            console.print(f"[bold red]Error:[/] Failed to access repository: {e}")
+            return []
+
+        for monitor in monitors:
+            # Reuse the cached issue if the monitor's violations are unchanged
+            entry = cached_entries.get(monitor["id"])
+            if entry is not None:
+                record(entry["issue"], monitor, "existing", entry["cached_at"])
+                continue
 
-            for issue in existing_issues:
-                if monitor["name"] in issue.title:
+            # Check if issue already exists
+            title = ISSUE_TITLE_TEMPLATE.format(name=monitor["name"])
+            issue = existing_issues.get(title)
+            if issue is not None:
+                console.print(
+                    f"[yellow]Issue already exists for monitor {monitor['name']}[/]"
+                )
+                record(issue, monitor, "existing")
+            else:
+                # Monitors sharing a name share a single new issue
+                pending.setdefault(title, []).append(monitor)
+
+        # Create the new issues one at a time; GitHub asks for content-creating
+        # requests to be made serially and rate limits bursts of them
+        issues_path = f"/repos/{repo_owner}/{repo_name}/issues"
+        for title, title_monitors in pending.items():
+            try:
+                response = await client.post(
+                    issues_path,
+                    json={
+                        "title": title,
+                        "body": _issue_body(title_monitors[0]),
+                        "labels": ISSUE_LABELS,
+                    },
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                for monitor in title_monitors:
                     console.print(
-                        f"[yellow]Issue already exists for monitor {monitor['name']}[/]"
-                    )
-                    duplicate_issue = True
-                    created_issues.append(
-                        {
-                            "url": issue.html_url,
-                            "number": issue.number,
-                            "title": issue.title,
-                            "monitor_id": monitor["id"],
-                            "monitor_name": monitor["name"],
-                            "status": "existing",
-                        }
+                        "[bold red]Error:[/] Failed to create issue for monitor "
+                        f"{monitor['name']}: {e}"
                     )
-                    break
-
-            if not duplicate_issue:
-                # Create new issue
-                issue = repo.create_issue(title=title, body=body, labels=labels)
+                continue
+
+            data = response.json()
+            issue = {
+                "url": data["html_url"],
+                "number": data["number"],
+                "title": data["title"],
+            }
+            for monitor in title_monitors:
                 console.print(
-                    f"[green]Created issue #{issue.number} for monitor {monitor['name']}[/]"
-                )
-
-                created_issues.append(
-                    {
-                        "url": issue.html_url,
-                        "number": issue.number,
-                        "title": issue.title,
-                        "monitor_id": monitor["id"],
-                        "monitor_name": monitor["name"],
-                        "status": "created",
-                    }
+                    f"[green]Created issue #{issue['number']} for monitor {monitor['name']}[/]"
                 )
+                record(issue, monitor, "created")
 
-        except github.GithubException as e:
-            console.print(
-                f"[bold red]Error:[/] Failed to create issue for monitor {monitor['name']}: {e}"
-            )
+    _save_issue_cache(cache)
 
     return created_issues
@@ -6,25 +6,22 @@ Sumo Logic Chores - GitHub Action for Sumo Logic administration tasks
 import os
 import sys
 import asyncio
-from typing import Dict, Optional, Set, Any
+from typing import Dict, FrozenSet, Optional, Any
 
 import typer
 from rich.console import Console
 
-# Try importing from src package first (for Docker/GitHub Actions)
-# If that fails, try relative imports (for local development)
-try:
-    from src.role_checker import check_user_roles
-    from src.monitor_validator import validate_monitor_tags
-    from src.github_utils import set_github_output
-except ModuleNotFoundError:
-    from role_checker import check_user_roles
-    from monitor_validator import validate_monitor_tags
-    from github_utils import set_github_output
+from src.role_checker import check_user_roles
+from src.monitor_validator import validate_monitor_tags
+from src.github_utils import set_github_output, to_json
+from src.sumo_client import create_client
 
 # Initialize console for rich output
 console = Console()
 
+# GitHub Actions environment, read once at import
+_IN_GHA = os.environ.get("GITHUB_ACTIONS") == "true"
+
 # Create a Typer app for command line handling
 app = typer.Typer(help="Sumo Logic Chores - GitHub Action for admin tasks")
 
@@ -32,12 +29,43 @@ app = typer.Typer(help="Sumo Logic Chores - GitHub Action for admin tasks")
 JsonDict = Dict[str, Any]
 
 
+def _parse_tags(value: Optional[str]) -> FrozenSet[str]:
+    """
+    Parse a comma-separated tag allowlist, ignoring blank entries
+
+    Args:
+        value: Comma-separated list of tags
+
+    Returns:
+        Set of tags
+    """
+    if not value:
+        return frozenset()
+    return frozenset(tag.strip() for tag in value.split(",") if tag.strip())
+
+
+def _serialize_for_actions(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode list and dict results as JSON for GitHub Actions outputs
+
+    Args:
+        results: Task results
+
+    Returns:
+        Results with structured values encoded as JSON strings
+    """
+    return {
+        key: to_json(value) if isinstance(value, (list, dict)) else value
+        for key, value in results.items()
+    }
+
+
 async def main_async(
     tasks: str = "all",
     sumo_access_id: str = "",
     sumo_access_key: str = "",
     role_id: Optional[str] = None,
-    tag_allowlist: Optional[str] = None,
+    allowed_tags: FrozenSet[str] = frozenset(),
     sumo_api_endpoint: str = "https://api.sumologic.com/api",
     github_token: Optional[str] = None,
 ) -> None:
@@ -54,44 +82,42 @@ async def main_async(
         console.print("[bold red]Error:[/] role_id is required for role-check task")
         sys.exit(1)
 
-    if "monitor-tags" in task_list and not tag_allowlist:
+    if "monitor-tags" in task_list and not allowed_tags:
         console.print(
             "[bold red]Error:[/] tag_allowlist is required for monitor-tags task"
         )
         sys.exit(1)
 
-    # Parse tag allowlist if provided
-    allowed_tags: Set[str] = set()
-    if tag_allowlist:
-        allowed_tags = {tag.strip() for tag in tag_allowlist.split(",")}
-
     # Track results for GitHub Actions outputs
     results: Dict[str, Any] = {}
 
-    # Execute selected tasks
-    if "role-check" in task_list:
-        console.print("[bold blue]Running role checker task...[/]")
-        role_results = await check_user_roles(
-            sumo_access_id=sumo_access_id,
-            sumo_access_key=sumo_access_key,
-            role_id=role_id,
-            api_endpoint=sumo_api_endpoint,
-        )
-        results.update(role_results)
-
-    if "monitor-tags" in task_list:
-        console.print("[bold blue]Running monitor tag validator task...[/]")
-        monitor_results = await validate_monitor_tags(
-            sumo_access_id=sumo_access_id,
-            sumo_access_key=sumo_access_key,
-            allowed_tags=allowed_tags,
-            api_endpoint=sumo_api_endpoint,
-            github_token=github_token,
-        )
-        results.update(monitor_results)
+    # Execute selected tasks over one shared Sumo Logic client
+    async with create_client(sumo_access_id, sumo_access_key) as client:
+        if "role-check" in task_list:
+            console.print("[bold blue]Running role checker task...[/]")
+            role_results = await check_user_roles(
+                sumo_access_id=sumo_access_id,
+                sumo_access_key=sumo_access_key,
+                role_id=role_id,
+                api_endpoint=sumo_api_endpoint,
+                client=client,
+            )
+            results.update(role_results)
+
+        if "monitor-tags" in task_list:
+            console.print("[bold blue]Running monitor tag validator task...[/]")
+            monitor_results = await validate_monitor_tags(
+                sumo_access_id=sumo_access_id,
+                sumo_access_key=sumo_access_key,
+                allowed_tags=allowed_tags,
+                api_endpoint=sumo_api_endpoint,
+                github_token=github_token,
+                client=client,
+            )
+            results.update(monitor_results)
 
     # Set GitHub Actions outputs
-    set_github_output(results)
+    set_github_output(_serialize_for_actions(results))
 
     # Print results
     console.print("[bold green]Tasks completed successfully[/]")
@@ -145,9 +171,7 @@ def main(
     Main entry point that runs the selected tasks
     """
     # Check for GitHub Actions environment
-    in_github_actions = os.environ.get("GITHUB_ACTIONS") == "true"
-
-    if in_github_actions:
+    if _IN_GHA:
         console.print("[bold]Running in GitHub Actions environment[/]")
     else:
         console.print("[bold]Running in local environment[/]")
@@ -159,7 +183,7 @@ def main(
             sumo_access_id=sumo_access_id,
             sumo_access_key=sumo_access_key,
             role_id=role_id,
-            tag_allowlist=tag_allowlist,
+            allowed_tags=_parse_tags(tag_allowlist),
             sumo_api_endpoint=sumo_api_endpoint,
             github_token=github_token,
         )
@@ -3,18 +3,16 @@
 Monitor Tag Validator module - Validates Sumo Logic monitor tags against an allowlist
 """
 
-import json
-from typing import Dict, List, Set, Any, Optional
+import asyncio
+import functools
+import os
+from typing import AbstractSet, Dict, List, Any, Optional
 
 import httpx
 from rich.console import Console
 
-# Try importing from src package first (for Docker/GitHub Actions)
-# If that fails, try relative imports (for local development)
-try:
-    from src.github_utils import create_github_issues
-except ModuleNotFoundError:
-    from github_utils import create_github_issues
+from src.github_utils import create_github_issues
+from src.sumo_client import cached_get_json, client_session, parse_json
 
 # Initialize console for rich output
 console = Console()
@@ -23,13 +21,104 @@ console = Console()
 JsonDict = Dict[str, Any]
 Monitor = Dict[str, Any]
 
+# Output names for the results returned by validate_monitor_tags, matching
+# the outputs declared in action.yml
+RESULT_KEYS = {
+    "monitors": "noncompliant_monitors",
+    "count": "noncompliant_count",
+    "issues": "issues_created",
+}
+
+# Per-monitor debug logging, enabled by GitHub Actions debug runs
+_DEBUG = os.environ.get("RUNNER_DEBUG") == "1"
+
+# Number of monitor IDs requested per call to the monitors endpoint
+CHUNK_SIZE = 50
+
+# Maximum number of monitor detail requests in flight at once
+MAX_CONCURRENT_REQUESTS = 10
+
+
+@functools.lru_cache(maxsize=8)
+def _service_url_for(api_endpoint: str) -> str:
+    """
+    Derive the Sumo Logic service host used in monitor URLs
+
+    Args:
+        api_endpoint: Sumo Logic API endpoint
+
+    Returns:
+        Service host name for the endpoint's deployment
+    """
+    api_host = api_endpoint.split("//")[1].split("/")[0]
+    if "." in api_host:
+        api_region = api_host.split(".")[0].split("api")[1] if "api" in api_host else ""
+        return (
+            f"service.{api_region}.sumologic.com"
+            if api_region
+            else "service.sumologic.com"
+        )
+    return "service.sumologic.com"
+
+
+async def _fetch_monitors(
+    client: httpx.AsyncClient, monitors_endpoint: str, monitor_ids: List[str]
+) -> List[Monitor]:
+    """
+    Fetch monitor details, requesting the IDs in concurrent chunks
+
+    Args:
+        client: HTTP client to use for the requests
+        monitors_endpoint: Sumo Logic monitors endpoint
+        monitor_ids: IDs of the monitors to fetch (all monitors if empty)
+
+    Returns:
+        List of monitor details
+    """
+    # Without IDs, fall back to a single request for all monitors
+    if not monitor_ids:
+        response = await client.get(monitors_endpoint, params={})
+        response.raise_for_status()
+        return parse_json(response).get("data", [])
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def fetch(chunk: List[str]) -> List[Monitor]:
+        async with semaphore:
+            response = await client.get(
+                monitors_endpoint, params={"ids": ",".join(chunk)}
+            )
+            response.raise_for_status()
+            return parse_json(response).get("data", [])
+
+    # A single chunk needs no concurrency
+    if len(monitor_ids) <= CHUNK_SIZE:
+        return await fetch(monitor_ids)
+
+    chunks = [
+        monitor_ids[i : i + CHUNK_SIZE] for i in range(0, len(monitor_ids), CHUNK_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(fetch(chunk) for chunk in chunks), return_exceptions=True
+    )
+
+    # Let every chunk finish, then surface the first failure to the caller
+    monitors: List[Monitor] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        monitors.extend(result)
+
+    return monitors
+
 
 async def validate_monitor_tags(
     sumo_access_id: str,
     sumo_access_key: str,
-    allowed_tags: Set[str],
+    allowed_tags: AbstractSet[str],
     api_endpoint: str = "https://api.sumologic.com/api",
     github_token: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """
     Validate Sumo Logic monitor tags against an allowlist
@@ -40,21 +129,27 @@ async def validate_monitor_tags(
         allowed_tags: Set of allowed tags
         api_endpoint: Sumo Logic API endpoint
         github_token: GitHub token for creating issues (optional)
+        client: Shared Sumo Logic API client (created if not provided)
 
     Returns:
         Dict containing monitors with non-compliant tags and count
     """
-    # Ensure API endpoint has no trailing slash
-    api_endpoint = api_endpoint.rstrip("/")
+    # Without an allowlist every tag would be flagged, so skip the check
+    if not allowed_tags:
+        console.print("[yellow]No tag allowlist provided, skipping validation[/]")
+        return {
+            RESULT_KEYS["monitors"]: [],
+            RESULT_KEYS["count"]: 0,
+        }
 
-    # Set up authentication for API requests
-    auth = (sumo_access_id, sumo_access_key)
+    # Set operations below need a frozenset; this is free if it already is one
+    allowed_tags = frozenset(allowed_tags)
 
-    # Set up headers for API requests
-    headers = {"Content-Type": "application/json", "Accept": "application/json"}
+    # Ensure API endpoint has no trailing slash
+    api_endpoint = api_endpoint.rstrip("/")
 
-    # Create async client for API requests
-    async with httpx.AsyncClient(auth=auth, headers=headers, timeout=30.0) as client:
+    # Reuse the shared client or create one for API requests
+    async with client_session(sumo_access_id, sumo_access_key, client) as client:
         # First, get monitor IDs using a different endpoint
         # For API v2
         if "/v2" in api_endpoint:
@@ -64,22 +159,19 @@ async def validate_monitor_tags(
             console.print(f"Fetching monitor IDs from {list_endpoint}")
 
             try:
-                response = await client.get(list_endpoint)
-                response.raise_for_status()
-                monitor_list = response.json()
+                monitor_list = await cached_get_json(client, list_endpoint)
                 monitor_ids = [item.get("id") for item in monitor_list.get("data", [])]
 
                 # If no monitors found, return empty result
                 if not monitor_ids:
                     console.print("[yellow]No monitors found[/]")
                     return {
-                        "non_compliant_monitors": json.dumps([]),
-                        "non_compliant_count": 0,
+                        RESULT_KEYS["monitors"]: [],
+                        RESULT_KEYS["count"]: 0,
                     }
 
                 # Now get the details for each monitor
                 monitors_endpoint = f"{api_endpoint}/monitors"
-                params = {"ids": ",".join(monitor_ids)}
 
             except httpx.HTTPStatusError as e:
                 # If that endpoint doesn't work, try a direct approach
@@ -88,7 +180,7 @@ async def validate_monitor_tags(
                 )
                 console.print("Trying alternative approach...")
                 monitors_endpoint = f"{api_endpoint}/monitors"
-                params = {}
+                monitor_ids = []
         else:
             # For V1 API
             # First get a list of all monitors
@@ -96,22 +188,19 @@ async def validate_monitor_tags(
             console.print(f"Fetching monitor IDs from {list_endpoint}")
 
             try:
-                response = await client.get(list_endpoint)
-                response.raise_for_status()
-                monitor_list = response.json()
+                monitor_list = await cached_get_json(client, list_endpoint)
                 monitor_ids = [item.get("id") for item in monitor_list.get("data", [])]
 
                 # If no monitors found, return empty result
                 if not monitor_ids:
                     console.print("[yellow]No monitors found[/]")
                     return {
-                        "non_compliant_monitors": json.dumps([]),
-                        "non_compliant_count": 0,
+                        RESULT_KEYS["monitors"]: [],
+                        RESULT_KEYS["count"]: 0,
                     }
 
                 # Now get the details for each monitor
                 monitors_endpoint = f"{api_endpoint}/v1/monitors"
-                params = {"ids": ",".join(monitor_ids)}
 
             except httpx.HTTPStatusError as e:
                 # If that endpoint doesn't work, try a direct approach
@@ -120,68 +209,60 @@ async def validate_monitor_tags(
                 )
                 console.print("Trying alternative approach...")
                 monitors_endpoint = f"{api_endpoint}/v1/monitors"
-                params = {}
+                monitor_ids = []
 
         console.print(f"Fetching monitors from {monitors_endpoint}")
 
         try:
-            response = await client.get(monitors_endpoint, params=params)
-            response.raise_for_status()
-            monitors_data = response.json()
-            monitors = monitors_data.get("data", [])
+            monitors = await _fetch_monitors(client, monitors_endpoint, monitor_ids)
 
             console.print(f"Found {len(monitors)} monitors")
 
             # Check each monitor for non-compliant tags
             non_compliant_monitors: List[Monitor] = []
+            service_url = _service_url_for(api_endpoint)
+            warning_lines: List[str] = []
+
+            if _DEBUG:
+                for monitor in monitors:
+                    if not monitor.get("tags"):
+                        name = monitor.get("name", "Unknown Monitor")
+                        console.print(f"Monitor {name} has no tags")
 
+            # Classify each monitor's tags with set operations against the
+            # allowlist; only flagged monitors are listed back in tag order
             for monitor in monitors:
+                tags = monitor.get("tags") or ()
+                non_compliant_set = frozenset(tags) - allowed_tags
+                if not non_compliant_set:
+                    continue
+
+                # Duplicate tags are listed once, in order of first appearance
+                tags = list(dict.fromkeys(tags))
+                non_compliant_tags = [tag for tag in tags if tag in non_compliant_set]
+                compliant_tags = [tag for tag in tags if tag not in non_compliant_set]
                 monitor_id = monitor.get("id")
                 monitor_name = monitor.get("name", "Unknown Monitor")
 
-                # Extract monitor tags
-                tags = set(monitor.get("tags", []))
-
-                if not tags:
-                    console.print(f"Monitor {monitor_name} has no tags")
-                    continue
-
-                # Find non-compliant tags
-                non_compliant_tags = tags - allowed_tags
-                compliant_tags = tags & allowed_tags
+                tags_str = ", ".join(non_compliant_tags)
+                warning_lines.append(
+                    f"[yellow]⚠[/] Monitor {monitor_name} has non-compliant tags: {tags_str}"
+                )
 
-                if non_compliant_tags:
-                    tags_str = ", ".join(non_compliant_tags)
-                    console.print(
-                        f"[yellow]⚠[/] Monitor {monitor_name} has non-compliant tags: {tags_str}"
-                    )
+                # Create monitor info
+                monitor_info = {
+                    "id": monitor_id,
+                    "name": monitor_name,
+                    "non_compliant_tags": non_compliant_tags,
+                    "compliant_tags": compliant_tags,
+                    "url": f"https://{service_url}/ui/#/monitor/edit/{monitor_id}",
+                }
 
-                    # Extract API path for monitor URL
-                    api_host = api_endpoint.split("//")[1].split("/")[0]
-                    if "." in api_host:
-                        api_region = (
-                            api_host.split(".")[0].split("api")[1]
-                            if "api" in api_host
-                            else ""
-                        )
-                        service_url = (
-                            f"service.{api_region}.sumologic.com"
-                            if api_region
-                            else "service.sumologic.com"
-                        )
-                    else:
-                        service_url = "service.sumologic.com"
-
-                    # Create monitor info
-                    monitor_info = {
-                        "id": monitor_id,
-                        "name": monitor_name,
-                        "non_compliant_tags": list(non_compliant_tags),
-                        "compliant_tags": list(compliant_tags),
-                        "url": f"https://{service_url}/ui/#/monitor/edit/{monitor_id}",
-                    }
+                non_compliant_monitors.append(monitor_info)
 
-                    non_compliant_monitors.append(monitor_info)
+            # Print the per-monitor warnings in one go
+            if warning_lines:
+                console.print("\n".join(warning_lines))
 
             # Create GitHub issues if token is provided
             github_issues = []
@@ -193,25 +274,26 @@ async def validate_monitor_tags(
 
             # Prepare results
             results = {
-                "non_compliant_monitors": json.dumps(non_compliant_monitors),
-                "non_compliant_count": len(non_compliant_monitors),
+                RESULT_KEYS["monitors"]: non_compliant_monitors,
+                RESULT_KEYS["count"]: len(non_compliant_monitors),
             }
 
             # Add GitHub issues to results if any were created
             if github_issues:
-                results["github_issues"] = json.dumps(github_issues)
+                results[RESULT_KEYS["issues"]] = github_issues
 
             # Print summary
             if non_compliant_monitors:
                 count = len(non_compliant_monitors)
-                console.print(
+                summary_lines = [
                     f"[bold yellow]Found {count} monitors with non-compliant tags[/]"
-                )
+                ]
                 for monitor in non_compliant_monitors:
                     tag_list = ", ".join(monitor["non_compliant_tags"])
-                    console.print(
+                    summary_lines.append(
                         f"  • {monitor['name']} - Non-compliant tags: {tag_list}"
                     )
+                console.print("\n".join(summary_lines))
             else:
                 console.print("[bold green]All monitors have compliant tags[/]")
 
@@ -3,14 +3,13 @@
 Role Checker module - Checks Sumo Logic users for a specific role ID
 """
 
-import json
+import asyncio
 import httpx
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from rich.console import Console
 
-# For potential future imports
-# Try importing from src package first (for Docker/GitHub Actions)
-# If that fails, try relative imports (for local development)
+from src.role_filter import filter_users_with_role, member_ids_from_role_ids
+from src.sumo_client import cached_get_items, cached_get_json, client_session
 
 # Initialize console for rich output
 console = Console()
@@ -19,12 +18,73 @@ console = Console()
 JsonDict = Dict[str, Any]
 User = Dict[str, Any]
 
+# User fields read by the role check; other fields are dropped while parsing
+USER_FIELDS = ("id", "email", "firstName", "lastName", "roleIds")
+
+# Maximum number of per-user role requests in flight at once
+MAX_CONCURRENT_REQUESTS = 16
+
+
+async def _fetch_member_ids_per_user(
+    client: httpx.AsyncClient, users_endpoint: str, role_id: str, users: List[User]
+) -> Set[str]:
+    """
+    Find the users holding a role by fetching each user's roles concurrently
+
+    Args:
+        client: HTTP client to use for the requests
+        users_endpoint: Sumo Logic users endpoint
+        role_id: Role ID to check for
+        users: Users to check
+
+    Returns:
+        IDs of the users that have the role
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def fetch_roles(user: User) -> List[JsonDict]:
+        async with semaphore:
+            roles = await cached_get_json(
+                client, f"{users_endpoint}/{user['id']}/roles"
+            )
+        return roles.get("data", [])
+
+    user_roles = await asyncio.gather(*(fetch_roles(user) for user in users))
+    return {
+        user["id"]
+        for user, roles in zip(users, user_roles)
+        if any(role.get("id") == role_id for role in roles)
+    }
+
+
+async def _fetch_role(
+    client: httpx.AsyncClient, roles_endpoint: str, role_id: str
+) -> Optional[JsonDict]:
+    """
+    Fetch a role, including its name and the IDs of its users
+
+    Args:
+        client: HTTP client to use for the request
+        roles_endpoint: Sumo Logic roles endpoint
+        role_id: Role ID to fetch
+
+    Returns:
+        The role, or None if it was not found
+    """
+    try:
+        return await cached_get_json(client, f"{roles_endpoint}/{role_id}")
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404:
+            raise
+        return None
+
 
 async def check_user_roles(
     sumo_access_id: str,
     sumo_access_key: str,
     role_id: str,
     api_endpoint: str = "https://api.sumologic.com/api",
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """
     Check which Sumo Logic users have a specific role attached
@@ -34,6 +94,7 @@ async def check_user_roles(
         sumo_access_key: Sumo Logic Access Key
         role_id: Role ID to check for
         api_endpoint: Sumo Logic API endpoint
+        client: Shared Sumo Logic API client (created if not provided)
 
     Returns:
         Dict containing users with the specified role and count
@@ -41,74 +102,81 @@ async def check_user_roles(
     # Ensure API endpoint has no trailing slash
     api_endpoint = api_endpoint.rstrip("/")
 
-    # Set up authentication for API requests
-    auth = (sumo_access_id, sumo_access_key)
-
-    # Set up headers for API requests
-    headers = {"Content-Type": "application/json", "Accept": "application/json"}
-
-    # Create async client for API requests
-    async with httpx.AsyncClient(auth=auth, headers=headers, timeout=30.0) as client:
+    # Reuse the shared client or create one for API requests
+    async with client_session(sumo_access_id, sumo_access_key, client) as client:
         # Get all users
         # Determine if we're using v2 API endpoint
         if "/v2" in api_endpoint:
             users_endpoint = f"{api_endpoint}/users"
+            roles_endpoint = f"{api_endpoint}/roles"
         else:
             users_endpoint = f"{api_endpoint}/v1/users"
+            roles_endpoint = f"{api_endpoint}/v1/roles"
 
         console.print(f"Fetching users from {users_endpoint}")
 
         try:
-            response = await client.get(users_endpoint)
-            response.raise_for_status()
-            users_data = response.json()
-            users = users_data.get("data", [])
+            # The users and the role are independent, so fetch them together.
+            # The role provides its name, and the membership for users
+            # without roleIds
+            users, role = await asyncio.gather(
+                cached_get_items(client, users_endpoint, USER_FIELDS),
+                _fetch_role(client, roles_endpoint, role_id),
+                return_exceptions=True,
+            )
+            if isinstance(users, BaseException):
+                raise users
 
             console.print(f"Found {len(users)} users")
 
+            # Dispatch on the payload shape: when the listing carries roleIds
+            # the role is matched without further requests, otherwise the
+            # role's membership is used rather than a request per user
+            has_role_ids = not users or "roleIds" in users[0]
+
+            if isinstance(role, BaseException):
+                # With roleIds the role only supplies its name, so a key that
+                # cannot read roles still gets a result
+                if not (has_role_ids and isinstance(role, httpx.HTTPStatusError)):
+                    raise role
+                role = None
+
+            if has_role_ids:
+                member_ids = member_ids_from_role_ids(users, frozenset((role_id,)))
+            elif role is not None:
+                member_ids = set(role.get("users", []))
+            else:
+                console.print(
+                    "[yellow]Role not found, checking roles for each user...[/]"
+                )
+                member_ids = await _fetch_member_ids_per_user(
+                    client, users_endpoint, role_id, users
+                )
+
+            # Shared by every match
+            role_name = role.get("name") if role is not None else None
+            role_label = {"id": role_id, "name": role_name or f"Role {role_id}"}
+
             # Check each user for the specified role
-            users_with_role: List[User] = []
-
-            for user in users:
-                user_id = user.get("id")
-                user_email = user.get("email")
-
-                # Check if this user already has the role in their roleIds list
-                # This avoids having to make an additional API call for each user
-                role_ids = user.get("roleIds", [])
-
-                if role_id in role_ids:
-                    user_info = {
-                        "id": user_id,
-                        "email": user_email,
-                        "firstName": user.get("firstName", ""),
-                        "lastName": user.get("lastName", ""),
-                        "role": {
-                            "id": role_id,
-                            "name": "Role "
-                            + role_id,  # We don't have the role name without an additional API call
-                        },
-                    }
-                    users_with_role.append(user_info)
-                    console.print(
-                        f"[green]✓[/] User {user_email} has the specified role"
-                    )
+            users_with_role = filter_users_with_role(users, member_ids, role_label)
 
             # Prepare results
             results = {
-                "users_with_role": json.dumps(users_with_role),
+                "users_with_role": users_with_role,
                 "users_count": len(users_with_role),
             }
 
             # Print summary
             if users_with_role:
-                console.print(
-                    f"[bold green]Found {len(users_with_role)} users with the specified role[/]"
-                )
+                count = len(users_with_role)
+                summary_lines = [
+                    f"[bold green]Found {count} users with the specified role[/]"
+                ]
                 for user in users_with_role:
-                    console.print(
+                    summary_lines.append(
                         f"  • {user['email']} ({user['firstName']} {user['lastName']})"
                     )
+                console.print("\n".join(summary_lines))
             else:
                 console.print("[bold yellow]No users found with the specified role[/]")
 
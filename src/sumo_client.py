@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Sumo Logic client utilities - Shared HTTP client for Sumo Logic API requests
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+# orjson is optional; fall back to httpx's stdlib json parsing when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is optional; without it listings are parsed in one piece
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Headers sent with every Sumo Logic API request
+HEADERS: Dict[str, str] = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+}
+
+# Connection pool size; HTTP/2 multiplexes concurrent requests over these
+MAX_CONNECTIONS = 32
+
+# Seconds a cached GET response stays fresh
+RESPONSE_CACHE_TTL = 60.0
+
+# Parsed GET responses per client, keyed by URL (and the fields kept for
+# listings), with the time they were fetched
+_response_cache: (
+    "weakref.WeakKeyDictionary[httpx.AsyncClient, Dict[Any, Tuple[float, Any]]]"
+) = weakref.WeakKeyDictionary()
+
+
+def create_client(sumo_access_id: str, sumo_access_key: str) -> httpx.AsyncClient:
+    """
+    Create an HTTP/2 client for the Sumo Logic API
+
+    Args:
+        sumo_access_id: Sumo Logic Access ID
+        sumo_access_key: Sumo Logic Access Key
+
+    Returns:
+        Async HTTP client authenticated with the access key
+    """
+    return httpx.AsyncClient(
+        auth=(sumo_access_id, sumo_access_key),
+        headers=HEADERS,
+        timeout=30.0,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+        ),
+    )
+
+
+def parse_json(response: httpx.Response) -> Any:
+    """
+    Parse a JSON response body, using orjson when available
+
+    Args:
+        response: HTTP response to parse
+
+    Returns:
+        Parsed JSON response body
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+async def cached_get_json(
+    client: httpx.AsyncClient, url: str, ttl: float = RESPONSE_CACHE_TTL
+) -> Any:
+    """
+    GET a URL and return the parsed JSON, reusing a recent response
+
+    Responses are cached per client, so different access keys never share
+    them. The cached value is returned as-is and must not be modified.
+
+    Args:
+        client: HTTP client to use for the request
+        url: URL to fetch
+        ttl: Seconds a cached response stays fresh
+
+    Returns:
+        Parsed JSON response body
+
+    Raises:
+        httpx.HTTPStatusError: If the request fails (errors are not cached)
+    """
+    cache = _response_cache.setdefault(client, {})
+    now = time.monotonic()
+    cached = cache.get(url)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+
+    response = await client.get(url)
+    response.raise_for_status()
+    data = parse_json(response)
+    cache[url] = (now, data)
+    return data
+
+
+class _ByteStreamReader:
+    """Async file-like view of a response byte stream, as read by ijson"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0) and treats any other
+        # empty read as the end of the stream
+        if size == 0:
+            return b""
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+def _keep_fields(item: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Trim a listing item to the given fields"""
+    return {key: item[key] for key in fields if key in item}
+
+
+async def _get_page(
+    client: httpx.AsyncClient,
+    url: str,
+    fields: Sequence[str],
+    token: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    GET one page of a listing, keeping only the given fields of its items
+
+    With ijson installed the body is streamed, so only the kept fields of
+    each item are ever held in memory.
+
+    Args:
+        client: HTTP client to use for the request
+        url: URL of the listing
+        fields: Item fields to keep
+        token: Token of the page to fetch (first page if not provided)
+
+    Returns:
+        Data items of the page and the token of the next page, if any
+    """
+    params = {"token": token} if token else None
+
+    if ijson is None:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        page = parse_json(response)
+        items = [_keep_fields(item, fields) for item in page.get("data", [])]
+        return items, page.get("next")
+
+    items: List[Dict[str, Any]] = []
+    next_token: Optional[str] = None
+    async with client.stream("GET", url, params=params) as response:
+        if response.status_code >= 400:
+            # Read the body so the error can report it
+            await response.aread()
+        response.raise_for_status()
+        reader = _ByteStreamReader(response.aiter_bytes())
+
+        # Build one data item at a time; the next page token may come
+        # before or after the items
+        builder = None
+        async for prefix, event, value in ijson.parse_async(reader, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "data.item" and event == "end_map":
+                    items.append(_keep_fields(builder.value, fields))
+                    builder = None
+            elif prefix == "data.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == "next" and event == "string":
+                next_token = value
+    return items, next_token
+
+
+async def iter_pages(
+    client: httpx.AsyncClient, url: str, fields: Sequence[str]
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Iterate over the pages of a listing, fetching each next page eagerly
+
+    The request for the next page is sent as soon as its token is known,
+    so it is in flight while the caller processes the current page.
+
+    Args:
+        client: HTTP client to use for the requests
+        url: URL of the listing
+        fields: Item fields to keep
+
+    Yields:
+        Data items of each page, trimmed to the given fields
+    """
+    next_page = asyncio.ensure_future(_get_page(client, url, fields))
+    try:
+        while next_page is not None:
+            items, token = await next_page
+            next_page = None
+            if token:
+                next_page = asyncio.ensure_future(_get_page(client, url, fields, token))
+            yield items
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+
+async def cached_get_items(
+    client: httpx.AsyncClient,
+    url: str,
+    fields: Sequence[str],
+    ttl: float = RESPONSE_CACHE_TTL,
+) -> List[Dict[str, Any]]:
+    """
+    GET every page of a listing and return its data items, reusing a
+    recent response
+
+    Args:
+        client: HTTP client to use for the request
+        url: URL of the listing
+        fields: Item fields to keep
+        ttl: Seconds a cached response stays fresh
+
+    Returns:
+        Data items of the listing, trimmed to the given fields
+
+    Raises:
+        httpx.HTTPStatusError: If the request fails (errors are not cached)
+    """
+    cache = _response_cache.setdefault(client, {})
+    key = (url, tuple(fields))
+    now = time.monotonic()
+    cached = cache.get(key)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+
+    items = [item async for page in iter_pages(client, url, fields) for item in page]
+    cache[key] = (now, items)
+    return items
+
+
+@asynccontextmanager
+async def client_session(
+    sumo_access_id: str,
+    sumo_access_key: str,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Use the given client, or a new client that is closed on exit
+
+    A given client is left open, so callers such as main_async can share one
+    client across tasks. A new client is bound to the running event loop, so
+    it is never kept beyond the session.
+
+    Args:
+        sumo_access_id: Sumo Logic Access ID
+        sumo_access_key: Sumo Logic Access Key
+        client: Existing client to reuse
+
+    Yields:
+        Async HTTP client for Sumo Logic API requests
+    """
+    if client is not None:
+        yield client
+        return
+    async with create_client(sumo_access_id, sumo_access_key) as new_client:
+        yield new_client
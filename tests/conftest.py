@@ -2,9 +2,15 @@
 Pytest configuration file with fixtures for Sumo Logic Chores tests
 """
 
+import json
 import os
+import re
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict, Any, List
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import patch
 
 import pytest
 import httpx
@@ -13,24 +19,36 @@ import httpx
 # --- Environment Setup Fixtures ---
 
 
-@pytest.fixture
+# KEY=value lines of a .env file, skipping blanks and comments
+ENV_LINE_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*)=(.*?)[ \t]*$", re.MULTILINE)
+
+
+@pytest.fixture(scope="session")
 def load_env():
     """Load environment variables from .env file if it exists"""
-    # Check if .env file exists
-    if os.path.exists(".env"):
-        # Read file and set environment variables
-        with open(".env", "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    os.environ[key] = value
+    env_file = Path(".env")
+    if env_file.exists():
+        os.environ.update(ENV_LINE_RE.findall(env_file.read_text()))
+
+
+@pytest.fixture(autouse=True)
+def isolate_issue_cache(tmp_path, monkeypatch):
+    """Keep the GitHub issue cache out of the real runner temp directory"""
+    monkeypatch.setattr(
+        "src.github_utils.ISSUE_CACHE_PATH", tmp_path / "sumo-issue-cache.json"
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolate_response_cache(monkeypatch):
+    """Start each test with an empty Sumo Logic response cache"""
+    monkeypatch.setattr("src.sumo_client._response_cache", weakref.WeakKeyDictionary())
 
 
 # --- Mock Data Fixtures ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_users_data() -> Dict[str, Any]:
     """Sample users data response from Sumo Logic API"""
     return {
@@ -72,7 +90,7 @@ def mock_users_data() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_roles_data() -> List[Dict[str, Any]]:
     """Sample role data responses for each user from Sumo Logic API"""
     return [
@@ -119,7 +137,7 @@ def mock_roles_data() -> List[Dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_monitors_data() -> Dict[str, Any]:
     """Sample monitors data response from Sumo Logic API"""
     return {
@@ -184,73 +202,189 @@ def mock_monitors_data() -> Dict[str, Any]:
 
 # --- Mock Client Fixtures ---
 
+# Mocked API routes, matched against v1 and v2 endpoint URLs
+USERS_RE = re.compile(r"/users$")
+USER_ROLES_RE = re.compile(r"/users/([^/]+)/roles$")
+ROLE_RE = re.compile(r"/roles/([^/]+)$")
+MONITORS_RE = re.compile(r"/monitors")
 
-@pytest.fixture
-def mock_httpx_client(mock_users_data, mock_roles_data, mock_monitors_data):
-    """Create a mocked httpx client for testing"""
 
-    class MockResponse:
-        def __init__(self, data, status_code=200):
-            self.status_code = status_code
-            self._data = data
+class MockResponse:
+    """Minimal stand-in for httpx.Response"""
+
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self._data = data
+        # Encoded body, so code parsing the raw content sees real JSON bytes
+        self.content = json.dumps(data).encode()
+
+    def json(self):
+        return self._data
+
+    async def aiter_bytes(self):
+        yield self.content
+
+    async def aread(self):
+        return self.content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"HTTP Error {self.status_code}",
+                request=httpx.Request("GET", "https://example.com"),
+                response=self,
+            )
+
+
+class FakeClient:
+    """Lightweight stand-in for httpx.AsyncClient that records requested URLs"""
+
+    def __init__(self, handler):
+        self._default_handler = handler
+        self.reset()
+
+    def reset(self):
+        """Restore the default handler and forget recorded requests"""
+        # Async callable taking (url, *args, **kwargs) and returning a response
+        self.handler = self._default_handler
+        self.requests = []
+        self.is_closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
-        def json(self):
-            return self._data
+    async def aclose(self):
+        self.is_closed = True
 
-        def raise_for_status(self):
-            if self.status_code >= 400:
-                raise httpx.HTTPStatusError(
-                    f"HTTP Error {self.status_code}",
-                    request=httpx.Request("GET", "https://example.com"),
-                    response=self,
-                )
+    async def get(self, url, *args, **kwargs):
+        self.requests.append(url)
+        return await self.handler(url, *args, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method, url, *args, **kwargs):
+        yield await self.get(url, *args, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def mock_get_handler(mock_users_data, mock_roles_data, mock_monitors_data):
+    """Route mocked GET requests to the sample data, built once per session"""
+
+    # Responses are encoded once and shared; tests only read them
+    users_response = MockResponse(mock_users_data)
+    user_roles_responses = [MockResponse(roles) for roles in mock_roles_data]
+    monitors_response = MockResponse(mock_monitors_data)
+    empty_response = MockResponse({"data": []})
+    not_found_response = MockResponse({}, status_code=404)
+
+    # Each role with the users that carry it
+    role_responses = {}
+    for roles in mock_roles_data:
+        for role in roles["data"]:
+            member_ids = [
+                user["id"]
+                for user in mock_users_data["data"]
+                if role["id"] in user["roleIds"]
+            ]
+            role_responses[role["id"]] = MockResponse({**role, "users": member_ids})
 
     async def mock_get(url, *args, **kwargs):
-        if "/v1/users" in url and not url.endswith("/roles"):
-            return MockResponse(mock_users_data)
-        elif "/v1/users/" in url and url.endswith("/roles"):
-            # Extract user ID from URL
-            user_id = url.split("/v1/users/")[1].split("/roles")[0]
-            # Map user ID to a mock roles response
-            user_index = (
-                int(user_id[-1]) - 1
-            )  # Get last character and convert to zero-based index
-            if 0 <= user_index < len(mock_roles_data):
-                return MockResponse(mock_roles_data[user_index])
-            return MockResponse({"data": []})
-        elif "/v1/monitors" in url:
-            return MockResponse(mock_monitors_data)
-        return MockResponse({"data": []})
-
-    # Create async mock client
-    mock_client = AsyncMock()
-    mock_client.get = AsyncMock(side_effect=mock_get)
-
-    # Mock enter/exit for async context manager
-    mock_client.__aenter__.return_value = mock_client
-
-    return mock_client
+        if USERS_RE.search(url):
+            return users_response
+        elif match := USER_ROLES_RE.search(url):
+            # Map the last digit of the user ID to a mock roles response
+            user_index = int(match.group(1)[-1]) - 1
+            if 0 <= user_index < len(user_roles_responses):
+                return user_roles_responses[user_index]
+            return empty_response
+        elif match := ROLE_RE.search(url):
+            return role_responses.get(match.group(1), not_found_response)
+        elif MONITORS_RE.search(url):
+            return monitors_response
+        return empty_response
+
+    return mock_get
+
+
+@pytest.fixture(scope="session")
+def shared_httpx_client(mock_get_handler):
+    """Mocked httpx client shared by the whole session"""
+    return FakeClient(mock_get_handler)
+
+
+@pytest.fixture(scope="module")
+def patch_httpx_client(shared_httpx_client):
+    """Have httpx.AsyncClient return the shared mocked client for a whole module"""
+
+    # A plain factory rather than a MagicMock stand-in for the class
+    def client_factory(*args, **kwargs):
+        return shared_httpx_client
+
+    with patch("httpx.AsyncClient", new=client_factory):
+        yield shared_httpx_client
 
 
 @pytest.fixture
-def mock_github_client():
-    """Create a mocked github client for testing"""
-    mock_repo = MagicMock()
+def mock_httpx_client(shared_httpx_client):
+    """Mocked httpx client for testing, reset so tests may replace its handler"""
+    shared_httpx_client.reset()
+    return shared_httpx_client
 
-    # Mock issue creation
-    mock_issue = MagicMock()
-    mock_issue.html_url = "https://github.com/owner/repo/issues/1"
-    mock_issue.number = 1
-    mock_issue.title = "Test Issue"
 
-    # Mock get_issues to return empty list (no existing issues)
-    mock_repo.get_issues.return_value = []
+@pytest.fixture
+def mock_httpx_client_without_role_ids(mock_httpx_client, mock_users_data):
+    """Mocked httpx client whose users response has no roleIds"""
+    users_data = {
+        "data": [
+            {key: value for key, value in user.items() if key != "roleIds"}
+            for user in mock_users_data["data"]
+        ]
+    }
+    mock_get = mock_httpx_client.handler
 
-    # Mock create_issue to return mock issue
-    mock_repo.create_issue.return_value = mock_issue
+    async def get_without_role_ids(url, *args, **kwargs):
+        if url.endswith("/v1/users"):
+            return MockResponse(users_data)
+        return await mock_get(url, *args, **kwargs)
+
+    mock_httpx_client.handler = get_without_role_ids
+    return mock_httpx_client
+
+
+@pytest.fixture
+def mock_github_api(monkeypatch):
+    """Mock the GitHub API with an httpx transport, starting with no open issues"""
+    api = SimpleNamespace(open_issues=[], requests=[], clients=0)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        api.requests.append(request)
+        if request.url.path == "/graphql":
+            issues = {
+                "nodes": api.open_issues,
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+            }
+            return httpx.Response(
+                200, json={"data": {"repository": {"issues": issues}}}
+            )
+        if request.method == "POST" and request.url.path.endswith("/issues"):
+            number = len(api.requests)
+            return httpx.Response(
+                201,
+                json={
+                    "number": number,
+                    "title": json.loads(request.content)["title"],
+                    "html_url": f"https://github.com/owner/repo/issues/{number}",
+                },
+            )
+        return httpx.Response(404)
 
-    # Mock Github client
-    mock_github = MagicMock()
-    mock_github.get_repo.return_value = mock_repo
+    def github_client(github_token):
+        api.clients += 1
+        return httpx.AsyncClient(
+            base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+        )
 
-    return mock_github
+    monkeypatch.setattr("src.github_utils._github_client", github_client)
+    return api
@@ -6,10 +6,9 @@ import json
 import pytest
 from unittest.mock import patch
 
-from src.main import main_async
+from src.main import _parse_tags, _serialize_for_actions, main_async
 
 
-@pytest.mark.asyncio
 async def test_main_async_role_check(mock_httpx_client):
     """Test main_async with role-check task"""
 
@@ -30,7 +29,6 @@ async def test_main_async_role_check(mock_httpx_client):
                     sumo_access_id="test_id",
                     sumo_access_key="test_key",
                     role_id="0000000000AAAAA1",
-                    tag_allowlist=None,
                     sumo_api_endpoint="https://api.sumologic.com/api",
                 )
 
@@ -46,14 +44,10 @@ async def test_main_async_role_check(mock_httpx_client):
                 assert len(users_with_role) == 2
 
                 # But monitor tag results are not present
-                assert "non_compliant_monitors" not in results
-                assert "non_compliant_count" not in results
+                assert "noncompliant_monitors" not in results
+                assert "noncompliant_count" not in results
 
 
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
-)
-@pytest.mark.asyncio
 async def test_main_async_monitor_tags(mock_httpx_client):
     """Test main_async with monitor-tags task"""
 
@@ -74,18 +68,18 @@ async def test_main_async_monitor_tags(mock_httpx_client):
                     sumo_access_id="test_id",
                     sumo_access_key="test_key",
                     role_id=None,
-                    tag_allowlist="prod,dev",
+                    allowed_tags=frozenset({"prod", "dev"}),
                     sumo_api_endpoint="https://api.sumologic.com/api",
                 )
 
                 # Check that monitor tag results are present
-                assert "non_compliant_monitors" in results
-                assert "non_compliant_count" in results
+                assert "noncompliant_monitors" in results
+                assert "noncompliant_count" in results
 
                 # Verify the data
-                non_compliant_monitors = json.loads(results["non_compliant_monitors"])
+                non_compliant_monitors = json.loads(results["noncompliant_monitors"])
                 assert (
-                    results["non_compliant_count"] == 3
+                    results["noncompliant_count"] == 3
                 )  # Three monitors have non-compliant tags
                 assert len(non_compliant_monitors) == 3
 
@@ -94,10 +88,6 @@ async def test_main_async_monitor_tags(mock_httpx_client):
                 assert "users_count" not in results
 
 
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
-)
-@pytest.mark.asyncio
 async def test_main_async_all_tasks(mock_httpx_client):
     """Test main_async with all tasks"""
 
@@ -118,15 +108,15 @@ async def test_main_async_all_tasks(mock_httpx_client):
                     sumo_access_id="test_id",
                     sumo_access_key="test_key",
                     role_id="0000000000AAAAA1",
-                    tag_allowlist="prod,dev",
+                    allowed_tags=frozenset({"prod", "dev"}),
                     sumo_api_endpoint="https://api.sumologic.com/api",
                 )
 
                 # Check that both sets of results are present
                 assert "users_with_role" in results
                 assert "users_count" in results
-                assert "non_compliant_monitors" in results
-                assert "non_compliant_count" in results
+                assert "noncompliant_monitors" in results
+                assert "noncompliant_count" in results
 
                 # Verify the role check data
                 users_with_role = json.loads(results["users_with_role"])
@@ -134,12 +124,11 @@ async def test_main_async_all_tasks(mock_httpx_client):
                 assert len(users_with_role) == 2
 
                 # Verify the monitor tag data
-                non_compliant_monitors = json.loads(results["non_compliant_monitors"])
-                assert results["non_compliant_count"] == 3
+                non_compliant_monitors = json.loads(results["noncompliant_monitors"])
+                assert results["noncompliant_count"] == 3
                 assert len(non_compliant_monitors) == 3
 
 
-@pytest.mark.asyncio
 async def test_main_async_missing_role_id():
     """Test main_async when role-check is selected but role_id is missing"""
 
@@ -149,15 +138,10 @@ async def test_main_async_missing_role_id():
             sumo_access_id="test_id",
             sumo_access_key="test_key",
             role_id=None,  # Missing role_id
-            tag_allowlist=None,
             sumo_api_endpoint="https://api.sumologic.com/api",
         )
 
 
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
-)
-@pytest.mark.asyncio
 async def test_main_async_missing_tag_allowlist():
     """Test main_async when monitor-tags is selected but tag_allowlist is missing"""
 
@@ -167,6 +151,24 @@ async def test_main_async_missing_tag_allowlist():
             sumo_access_id="test_id",
             sumo_access_key="test_key",
             role_id=None,
-            tag_allowlist=None,  # Missing tag_allowlist
+            allowed_tags=frozenset(),  # Missing tag_allowlist
             sumo_api_endpoint="https://api.sumologic.com/api",
         )
+
+
+def test_parse_tags_ignores_blank_entries():
+    """Test the tag allowlist parser strips and drops empty entries"""
+
+    assert _parse_tags(" prod, dev,,") == frozenset({"prod", "dev"})
+    assert _parse_tags(None) == frozenset()
+
+
+def test_serialize_for_actions_encodes_structured_results():
+    """Test task results are JSON-encoded only for GitHub Actions outputs"""
+
+    results = {"users_with_role": [{"id": "1"}], "users_count": 1}
+
+    assert _serialize_for_actions(results) == {
+        "users_with_role": '[{"id":"1"}]',
+        "users_count": 1,
+    }
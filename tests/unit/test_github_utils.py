@@ -2,19 +2,40 @@
 Unit tests for github_utils module
 """
 
-import os
-import pytest
+import json
 import tempfile
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src import github_utils
+from src.github_utils import (
+    _fetch_open_issues,
+    create_github_issues,
+    set_github_output,
+    to_json,
+)
+
+
+def test_to_json_is_compact():
+    """Test to_json produces compact JSON with and without orjson"""
+
+    value = [{"name": "Monitor ✓", "tags": ["api", "latency"]}]
+    expected = '[{"name":"Monitor ✓","tags":["api","latency"]}]'
+
+    assert to_json(value) == expected
 
-from src.github_utils import set_github_output, create_github_issues
+    # Fall back to stdlib json when orjson is not installed
+    with patch("src.github_utils.orjson", None):
+        assert to_json(value) == expected
 
 
 def test_set_github_output_not_in_github_actions():
     """Test set_github_output when not running in GitHub Actions"""
 
-    # Ensure GITHUB_ACTIONS environment variable is not set
-    with patch.dict(os.environ, {}, clear=True):
+    # Simulate GITHUB_ACTIONS not being set at import
+    with patch("src.github_utils._IN_GHA", False):
         # Call set_github_output with sample results
         set_github_output({"test_key": "test_value"})
         # Not much we can assert here, but the function should not raise an exception
@@ -24,7 +45,9 @@ def test_set_github_output_without_output_file():
     """Test set_github_output when GITHUB_OUTPUT is not set"""
 
     # Set GITHUB_ACTIONS to true but don't set GITHUB_OUTPUT
-    with patch.dict(os.environ, {"GITHUB_ACTIONS": "true"}, clear=True):
+    with patch("src.github_utils._IN_GHA", True), patch(
+        "src.github_utils._GH_OUTPUT", None
+    ):
         # Capture print output
         with patch("builtins.print") as mock_print:
             # Call set_github_output with sample results
@@ -39,11 +62,9 @@ def test_set_github_output_with_output_file():
 
     # Create a temporary file to use as GITHUB_OUTPUT
     with tempfile.NamedTemporaryFile(mode="w+") as temp_file:
-        # Set environment variables
-        with patch.dict(
-            os.environ,
-            {"GITHUB_ACTIONS": "true", "GITHUB_OUTPUT": temp_file.name},
-            clear=True,
+        # Set GitHub Actions environment
+        with patch("src.github_utils._IN_GHA", True), patch(
+            "src.github_utils._GH_OUTPUT", temp_file.name
         ):
             # Call set_github_output with sample results
             set_github_output(
@@ -60,8 +81,7 @@ def test_set_github_output_with_output_file():
             assert "line1\nline2\nline3\nEOF" in output_content
 
 
-@pytest.mark.asyncio
-async def test_create_github_issues_success(mock_github_client):
+async def test_create_github_issues_success(mock_github_api):
     """Test create_github_issues successful issue creation"""
 
     # Sample monitor data with non-compliant tags
@@ -83,27 +103,37 @@ async def test_create_github_issues_success(mock_github_client):
     ]
 
     # Mock GitHub repository and issue creation
-    with patch("github.Github", return_value=mock_github_client):
-        with patch.dict(os.environ, {"GITHUB_REPOSITORY": "owner/repo"}, clear=True):
-            created_issues = await create_github_issues(
-                monitors=monitors, github_token="fake_token"
-            )
-
-            # Check that issues were created
-            assert len(created_issues) == 2
+    with patch("src.github_utils._DEF_OWNER", "owner"), patch(
+        "src.github_utils._DEF_REPO", "repo"
+    ):
+        created_issues = await create_github_issues(
+            monitors=monitors, github_token="fake_token"
+        )
+
+        # Check that issues were created
+        assert len(created_issues) == 2
+
+        # Check issue details
+        for issue in created_issues:
+            assert "url" in issue
+            assert "number" in issue
+            assert "title" in issue
+            assert "monitor_id" in issue
+            assert issue["status"] == "created"
+
+        # Check one issue was created per monitor, and no others
+        assert {issue["monitor_name"] for issue in created_issues} == {
+            "API Latency Monitor",
+            "Network Traffic Monitor",
+        }
 
-            # Check issue details
-            for issue in created_issues:
-                assert "url" in issue
-                assert "number" in issue
-                assert "title" in issue
-                assert "monitor_id" in issue
-                assert "monitor_name" in issue
-                assert issue["status"] == "created"
+        # Check existing issues were fetched once for all monitors
+        paths = [request.url.path for request in mock_github_api.requests]
+        assert paths.count("/graphql") == 1
+        assert paths.count("/repos/owner/repo/issues") == 2
 
 
-@pytest.mark.asyncio
-async def test_create_github_issues_with_existing_issues(mock_github_client):
+async def test_create_github_issues_with_existing_issues(mock_github_api):
     """Test create_github_issues when issues already exist"""
 
     # Sample monitor data
@@ -118,32 +148,52 @@ async def test_create_github_issues_with_existing_issues(mock_github_client):
     ]
 
     # Mock existing issues
-    mock_issue = MagicMock()
-    mock_issue.html_url = "https://github.com/owner/repo/issues/1"
-    mock_issue.number = 1
-    mock_issue.title = (
-        "Non-compliant tags found in Sumo Logic monitor: API Latency Monitor"
+    mock_github_api.open_issues.append(
+        {
+            "url": "https://github.com/owner/repo/issues/1",
+            "number": 1,
+            "title": "Non-compliant tags found in Sumo Logic monitor: API Latency Monitor",
+        }
     )
 
-    mock_repo = mock_github_client.get_repo.return_value
-    mock_repo.get_issues.return_value = [mock_issue]
+    with patch("src.github_utils._DEF_OWNER", "owner"), patch(
+        "src.github_utils._DEF_REPO", "repo"
+    ):
+        created_issues = await create_github_issues(
+            monitors=monitors, github_token="fake_token"
+        )
 
-    # Mock GitHub repository and issue creation
-    with patch("github.Github", return_value=mock_github_client):
-        with patch.dict(os.environ, {"GITHUB_REPOSITORY": "owner/repo"}, clear=True):
-            created_issues = await create_github_issues(
-                monitors=monitors, github_token="fake_token"
-            )
+        # Check that issues were found but not created
+        assert len(created_issues) == 1
+        assert created_issues[0]["status"] == "existing"
+        assert created_issues[0]["number"] == 1
 
-            # Check that issues were found but not created
-            assert len(created_issues) == 1
-            assert created_issues[0]["status"] == "existing"
-            assert created_issues[0]["number"] == 1
 
+async def test_fetch_open_issues_follows_pages():
+    """Test _fetch_open_issues requests every page of the GraphQL query"""
 
-@pytest.mark.asyncio
-async def test_create_github_issues_missing_repo_info():
-    """Test create_github_issues when repository information is missing"""
+    cursors = []
+
+    def handler(request):
+        cursor = json.loads(request.content)["variables"].get("cursor")
+        cursors.append(cursor)
+        issues = {
+            "nodes": [{"number": 1, "title": f"Issue {cursor}", "url": "u"}],
+            "pageInfo": {"hasNextPage": cursor is None, "endCursor": "cursor1"},
+        }
+        return httpx.Response(200, json={"data": {"repository": {"issues": issues}}})
+
+    async with httpx.AsyncClient(
+        base_url="https://api.github.com", transport=httpx.MockTransport(handler)
+    ) as client:
+        issues = await _fetch_open_issues(client, "owner", "repo")
+
+    assert cursors == [None, "cursor1"]
+    assert set(issues) == {"Issue None", "Issue cursor1"}
+
+
+async def test_create_github_issues_uses_cache(mock_github_api):
+    """Test create_github_issues skips GitHub for unchanged cached monitors"""
 
     # Sample monitor data
     monitors = [
@@ -156,15 +206,110 @@ async def test_create_github_issues_missing_repo_info():
         }
     ]
 
-    # Mock GitHub client
-    mock_github = MagicMock()
+    with patch("src.github_utils._DEF_OWNER", "owner"), patch(
+        "src.github_utils._DEF_REPO", "repo"
+    ):
+        created_issues = await create_github_issues(
+            monitors=monitors, github_token="fake_token"
+        )
+        cached_issues = await create_github_issues(
+            monitors=monitors, github_token="fake_token"
+        )
+
+        # Check the second run was answered from the cache
+        assert mock_github_api.clients == 1
+        assert len(cached_issues) == 1
+        assert cached_issues[0]["status"] == "existing"
+        assert cached_issues[0]["number"] == created_issues[0]["number"]
+
+        # Check a change in violations bypasses the cache
+        monitors[0]["non_compliant_tags"] = ["api"]
+        await create_github_issues(monitors=monitors, github_token="fake_token")
+        assert mock_github_api.clients == 2
+
+
+async def test_create_github_issues_cache_expires_and_prunes(mock_github_api):
+    """Test create_github_issues rechecks stale entries and drops fixed monitors"""
+
+    monitors = [
+        {
+            "id": f"0000000000MONITOR{i}",
+            "name": f"Monitor {i}",
+            "compliant_tags": ["prod"],
+            "non_compliant_tags": ["api"],
+            "url": f"https://service.api.sumologic.com/ui/#/monitor/edit/{i}",
+        }
+        for i in (1, 2)
+    ]
 
-    # Clear environment and don't provide repo info
-    with patch("github.Github", return_value=mock_github):
-        with patch.dict(os.environ, {}, clear=True):
-            created_issues = await create_github_issues(
-                monitors=monitors, github_token="fake_token"
+    with patch("src.github_utils._DEF_OWNER", "owner"), patch(
+        "src.github_utils._DEF_REPO", "repo"
+    ):
+        await create_github_issues(monitors=monitors, github_token="fake_token")
+
+        # Monitor 2 is fixed and drops out of the cache
+        await create_github_issues(monitors=monitors[:1], github_token="fake_token")
+        assert mock_github_api.clients == 1
+        cache = json.loads(github_utils.ISSUE_CACHE_PATH.read_bytes())
+        assert set(cache) == {"0000000000MONITOR1"}
+
+        # Once the cached issue is older than the TTL, GitHub is checked again
+        # and, with the issue closed in the meantime, a new one is created
+        with patch("src.github_utils.ISSUE_CACHE_TTL", 0):
+            issues = await create_github_issues(
+                monitors=monitors[:1], github_token="fake_token"
             )
+        assert mock_github_api.clients == 2
+        assert issues[0]["status"] == "created"
+
+
+@pytest.mark.parametrize("content", [b"[]", b"null", b"{not json"])
+async def test_create_github_issues_ignores_bad_cache(mock_github_api, content):
+    """Test create_github_issues treats a malformed issue cache as empty"""
+
+    github_utils.ISSUE_CACHE_PATH.write_bytes(content)
+    monitors = [
+        {
+            "id": "0000000000MONITOR1",
+            "name": "API Latency Monitor",
+            "compliant_tags": ["prod"],
+            "non_compliant_tags": ["api"],
+            "url": "https://service.api.sumologic.com/ui/#/monitor/edit/1",
+        }
+    ]
+
+    with patch("src.github_utils._DEF_OWNER", "owner"), patch(
+        "src.github_utils._DEF_REPO", "repo"
+    ):
+        issues = await create_github_issues(
+            monitors=monitors, github_token="fake_token"
+        )
+
+    assert [issue["status"] for issue in issues] == ["created"]
+
+
+async def test_create_github_issues_missing_repo_info(mock_github_api):
+    """Test create_github_issues when repository information is missing"""
+
+    # Sample monitor data
+    monitors = [
+        {
+            "id": "0000000000MONITOR1",
+            "name": "API Latency Monitor",
+            "compliant_tags": ["prod"],
+            "non_compliant_tags": ["api", "latency"],
+            "url": "https://service.api.sumologic.com/ui/#/monitor/edit/0000000000MONITOR1",
+        }
+    ]
 
-            # Check that no issues were created due to missing repo info
-            assert len(created_issues) == 0
+    # Clear default repository and don't provide repo info
+    with patch("src.github_utils._DEF_OWNER", None), patch(
+        "src.github_utils._DEF_REPO", None
+    ):
+        created_issues = await create_github_issues(
+            monitors=monitors, github_token="fake_token"
+        )
+
+        # Check that no issues were created due to missing repo info
+        assert len(created_issues) == 0
+        assert mock_github_api.clients == 0
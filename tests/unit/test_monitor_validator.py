@@ -2,86 +2,30 @@
 Unit tests for monitor_validator module
 """
 
-import json
+import re
+import weakref
+from pathlib import Path
+
 import pytest
-from unittest.mock import patch, AsyncMock
+import pytest_asyncio
 
-from src.monitor_validator import validate_monitor_tags
+import httpx
 
+from src.monitor_validator import CHUNK_SIZE, RESULT_KEYS, validate_monitor_tags
 
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
-)
-@pytest.mark.asyncio
-async def test_validate_monitor_tags_with_violations(mock_httpx_client):
-    """Test validate_monitor_tags when monitors with non-compliant tags are found"""
-
-    # Only allow prod and dev tags
-    allowed_tags = {"prod", "dev"}
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        # Don't create GitHub issues in this test
-        with patch("src.monitor_validator.create_github_issues", return_value=[]):
-            results = await validate_monitor_tags(
-                sumo_access_id="test_id",
-                sumo_access_key="test_key",
-                allowed_tags=allowed_tags,
-                api_endpoint="https://api.sumologic.com/api",
-                github_token=None,
-            )
+# Have httpx.AsyncClient return the shared mocked client in every test
+pytestmark = pytest.mark.usefixtures("patch_httpx_client")
 
-            # Parse the non_compliant_monitors JSON string to a list
-            non_compliant_monitors = json.loads(results["non_compliant_monitors"])
-
-            # Check the count matches
-            assert (
-                results["non_compliant_count"] == 3
-            )  # We have 3 monitors with non-compliant tags
-
-            # Check we have the expected monitors
-            assert len(non_compliant_monitors) == 3
-
-            # Get monitor names
-            monitor_names = [monitor["name"] for monitor in non_compliant_monitors]
-            assert (
-                "API Latency Monitor" in monitor_names
-            )  # Has 'latency' and 'api' tags
-            assert (
-                "Database CPU Monitor" in monitor_names
-            )  # Has 'database' and 'performance' tags
-            assert (
-                "Network Traffic Monitor" in monitor_names
-            )  # Has 'network', 'traffic', 'critical' tags
-
-            # Check non-compliant tags
-            for monitor in non_compliant_monitors:
-                if monitor["name"] == "API Latency Monitor":
-                    assert set(monitor["non_compliant_tags"]) == {"api", "latency"}
-                    assert set(monitor["compliant_tags"]) == {"prod"}
-                elif monitor["name"] == "Database CPU Monitor":
-                    assert set(monitor["non_compliant_tags"]) == {
-                        "database",
-                        "performance",
-                    }
-                    assert set(monitor["compliant_tags"]) == {"dev"}
-                elif monitor["name"] == "Network Traffic Monitor":
-                    assert set(monitor["non_compliant_tags"]) == {
-                        "network",
-                        "traffic",
-                        "critical",
-                    }
-                    assert set(monitor["compliant_tags"]) == {"prod"}
-
-
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
-)
-@pytest.mark.asyncio
-async def test_validate_monitor_tags_no_violations(mock_httpx_client):
-    """Test validate_monitor_tags when all monitors have compliant tags"""
 
-    # Allow all tags that exist in our monitors
-    allowed_tags = {
+class _ApiError(Exception):
+    """Error raised by the mocked API"""
+
+
+# Tag allowlists shared by the tests
+ALLOWED_MINIMAL = frozenset({"prod", "dev"})
+# Every tag that exists in our monitors
+ALLOWED_ALL = frozenset(
+    {
         "prod",
         "dev",
         "api",
@@ -92,97 +36,236 @@ async def test_validate_monitor_tags_no_violations(mock_httpx_client):
         "traffic",
         "critical",
     }
+)
 
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        results = await validate_monitor_tags(
+# Issues returned by the mocked GitHub issue creation, built once at import
+MOCK_ISSUES = (
+    {
+        "url": "https://github.com/owner/repo/issues/1",
+        "number": 1,
+        "title": "Non-compliant tags found in Sumo Logic monitor: API Latency Monitor",
+        "monitor_id": "0000000000MONITOR1",
+        "monitor_name": "API Latency Monitor",
+        "status": "created",
+    },
+    {
+        "url": "https://github.com/owner/repo/issues/2",
+        "number": 2,
+        "title": "Non-compliant tags found in Sumo Logic monitor: Database CPU Monitor",
+        "monitor_id": "0000000000MONITOR2",
+        "monitor_name": "Database CPU Monitor",
+        "status": "created",
+    },
+    {
+        "url": "https://github.com/owner/repo/issues/3",
+        "number": 3,
+        "title": "Non-compliant tags found in Sumo Logic monitor: Network Traffic Monitor",
+        "monitor_id": "0000000000MONITOR3",
+        "monitor_name": "Network Traffic Monitor",
+        "status": "created",
+    },
+)
+
+# Non-compliant and compliant tags expected per monitor for ALLOWED_MINIMAL
+EXPECTED_TAGS = {
+    "API Latency Monitor": (frozenset({"api", "latency"}), frozenset({"prod"})),
+    "Database CPU Monitor": (
+        frozenset({"database", "performance"}),
+        frozenset({"dev"}),
+    ),
+    "Network Traffic Monitor": (
+        frozenset({"network", "traffic", "critical"}),
+        frozenset({"prod"}),
+    ),
+}
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def violation_results(shared_httpx_client):
+    """Results of validating the mock monitors against ALLOWED_MINIMAL, run once"""
+    shared_httpx_client.reset()
+    with pytest.MonkeyPatch.context() as mp:
+        # Keep cached responses out of the module-level cache
+        mp.setattr("src.sumo_client._response_cache", weakref.WeakKeyDictionary())
+
+        # Mock GitHub issue creation
+        async def mock_create_github_issues(*args, **kwargs):
+            return list(MOCK_ISSUES)
+
+        mp.setattr(
+            "src.monitor_validator.create_github_issues", mock_create_github_issues
+        )
+        return await validate_monitor_tags(
             sumo_access_id="test_id",
             sumo_access_key="test_key",
-            allowed_tags=allowed_tags,
+            allowed_tags=ALLOWED_MINIMAL,
             api_endpoint="https://api.sumologic.com/api",
-            github_token=None,
+            github_token="fake_token",
+            client=shared_httpx_client,
         )
 
-        # Parse the non_compliant_monitors JSON string to a list
-        non_compliant_monitors = json.loads(results["non_compliant_monitors"])
 
-        # Check the count matches
-        assert results["non_compliant_count"] == 0
+@pytest.mark.parametrize(
+    "allowed_tags,expected_count,expected_names",
+    [
+        # Every monitor has tags outside the minimal allowlist
+        (ALLOWED_MINIMAL, 3, EXPECTED_TAGS.keys()),
+        # All monitor tags are allowed
+        (ALLOWED_ALL, 0, set()),
+    ],
+)
+async def test_validate_monitor_tags(
+    mock_httpx_client, allowed_tags, expected_count, expected_names
+):
+    """Test validate_monitor_tags reports exactly the non-compliant monitors"""
+
+    results = await validate_monitor_tags(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        allowed_tags=allowed_tags,
+        api_endpoint="https://api.sumologic.com/api",
+        github_token=None,
+    )
+
+    non_compliant_monitors = results["noncompliant_monitors"]
 
-        # Check we have no non-compliant monitors
-        assert len(non_compliant_monitors) == 0
+    # Check the count matches
+    assert results["noncompliant_count"] == expected_count
 
+    # Check we have the expected monitors
+    assert len(non_compliant_monitors) == expected_count
+    assert {monitor["name"] for monitor in non_compliant_monitors} == expected_names
 
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
+
+@pytest.mark.parametrize(
+    "monitor_name,non_compliant_tags,compliant_tags",
+    [(name, *tags) for name, tags in EXPECTED_TAGS.items()],
 )
-@pytest.mark.asyncio
-async def test_validate_monitor_tags_with_github_issues(mock_httpx_client):
-    """Test validate_monitor_tags with GitHub issue creation"""
+def test_validate_monitor_tags_flags_monitor(
+    violation_results, monitor_name, non_compliant_tags, compliant_tags
+):
+    """Test validate_monitor_tags reports a monitor's non-compliant and compliant tags"""
+
+    by_name = {
+        monitor["name"]: monitor
+        for monitor in violation_results["noncompliant_monitors"]
+    }
+    monitor = by_name[monitor_name]
+    assert frozenset(monitor["non_compliant_tags"]) == non_compliant_tags
+    assert frozenset(monitor["compliant_tags"]) == compliant_tags
 
-    # Only allow prod tag
-    allowed_tags = {"prod"}
-
-    # Mock GitHub issue creation
-    mock_issues = [
-        {
-            "url": "https://github.com/owner/repo/issues/1",
-            "number": 1,
-            "title": "Non-compliant tags found in Sumo Logic monitor: API Latency Monitor",
-            "monitor_id": "0000000000MONITOR1",
-            "monitor_name": "API Latency Monitor",
-            "status": "created",
-        },
-        {
-            "url": "https://github.com/owner/repo/issues/2",
-            "number": 2,
-            "title": "Non-compliant tags found in Sumo Logic monitor: Database CPU Monitor",
-            "monitor_id": "0000000000MONITOR2",
-            "monitor_name": "Database CPU Monitor",
-            "status": "created",
-        },
-        {
-            "url": "https://github.com/owner/repo/issues/3",
-            "number": 3,
-            "title": "Non-compliant tags found in Sumo Logic monitor: Network Traffic Monitor",
-            "monitor_id": "0000000000MONITOR3",
-            "monitor_name": "Network Traffic Monitor",
-            "status": "created",
-        },
-    ]
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        with patch(
-            "src.monitor_validator.create_github_issues", return_value=mock_issues
-        ) as mock_create_issues:
-            # Call the function
-            await validate_monitor_tags(
-                sumo_access_id="test_id",
-                sumo_access_key="test_key",
-                allowed_tags=allowed_tags,
-                api_endpoint="https://api.sumologic.com/api",
-                github_token="fake_token",
-            )
 
-            # Check GitHub issues were created
-            assert mock_create_issues.called
+def test_validate_monitor_tags_with_github_issues(violation_results):
+    """Test validate_monitor_tags with GitHub issue creation"""
+
+    # Check GitHub issues were created and included in the results
+    assert violation_results["issues_created"] == list(MOCK_ISSUES)
 
 
-@pytest.mark.skip(
-    reason="Temporarily disabled while monitor_validator needs more attention"
-)
-@pytest.mark.asyncio
 async def test_validate_monitor_tags_api_error(mock_httpx_client):
     """Test validate_monitor_tags when the API returns an error"""
 
     # Mock httpx client to raise an exception
-    mock_httpx_client.get = AsyncMock(side_effect=Exception("API Error"))
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        with pytest.raises(Exception, match="API Error"):
-            await validate_monitor_tags(
-                sumo_access_id="test_id",
-                sumo_access_key="test_key",
-                allowed_tags={"prod", "dev"},
-                api_endpoint="https://api.sumologic.com/api",
-                github_token=None,
+    async def mock_get(url, *args, **kwargs):
+        raise _ApiError()
+
+    mock_httpx_client.handler = mock_get
+
+    with pytest.raises(_ApiError):
+        await validate_monitor_tags(
+            sumo_access_id="test_id",
+            sumo_access_key="test_key",
+            allowed_tags=ALLOWED_MINIMAL,
+            api_endpoint="https://api.sumologic.com/api",
+            github_token=None,
+        )
+
+
+async def test_validate_monitor_tags_fetches_monitors_in_chunks(
+    mock_httpx_client, mock_monitors_data
+):
+    """Test validate_monitor_tags requests monitor details in concurrent chunks"""
+
+    # Return more monitor IDs than fit in a single chunk
+    monitor_ids = [f"MONITOR{i}" for i in range(CHUNK_SIZE * 2 + 1)]
+    chunk_params = []
+
+    async def mock_get(url, *args, **kwargs):
+        request = httpx.Request("GET", url)
+        if url.endswith("/v1/monitors/queries"):
+            data = {"data": [{"id": i} for i in monitor_ids]}
+            return httpx.Response(200, json=data, request=request)
+        chunk_params.append(kwargs["params"]["ids"])
+        return httpx.Response(200, json=mock_monitors_data, request=request)
+
+    mock_httpx_client.handler = mock_get
+
+    await validate_monitor_tags(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        allowed_tags=ALLOWED_MINIMAL,
+        api_endpoint="https://api.sumologic.com/api",
+        github_token=None,
+    )
+
+    # Check every monitor ID was requested exactly once, in three chunks
+    assert len(chunk_params) == 3
+    assert [i for ids in chunk_params for i in ids.split(",")] == monitor_ids
+
+
+async def test_validate_monitor_tags_lists_duplicate_tags_once(mock_httpx_client):
+    """Test validate_monitor_tags reports each tag once, in first-seen order"""
+
+    monitor = {
+        "id": "MONITOR1",
+        "name": "Dup Monitor",
+        "tags": ["prod", "api", "api", "prod"],
+    }
+
+    async def mock_get(url, *args, **kwargs):
+        request = httpx.Request("GET", url)
+        if url.endswith("/v1/monitors/queries"):
+            return httpx.Response(
+                200, json={"data": [{"id": "MONITOR1"}]}, request=request
             )
+        return httpx.Response(200, json={"data": [monitor]}, request=request)
+
+    mock_httpx_client.handler = mock_get
+
+    results = await validate_monitor_tags(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        allowed_tags=ALLOWED_MINIMAL,
+        api_endpoint="https://api.sumologic.com/api",
+        github_token=None,
+    )
+
+    (flagged,) = results["noncompliant_monitors"]
+    assert flagged["non_compliant_tags"] == ["api"]
+    assert flagged["compliant_tags"] == ["prod"]
+
+
+async def test_validate_monitor_tags_empty_allowlist(mock_httpx_client):
+    """Test validate_monitor_tags skips the API when no tags are allowed"""
+
+    results = await validate_monitor_tags(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        allowed_tags=frozenset(),
+        api_endpoint="https://api.sumologic.com/api",
+        github_token="fake_token",
+    )
+
+    assert results["noncompliant_count"] == 0
+    assert results["noncompliant_monitors"] == []
+    assert not mock_httpx_client.requests
+
+
+def test_result_keys_match_action_outputs():
+    """Test every validate_monitor_tags result is a declared action output"""
+
+    action = (Path(__file__).parents[2] / "action.yml").read_text()
+    outputs = action.split("\noutputs:\n", 1)[1].split("\nruns:", 1)[0]
+    declared = set(re.findall(r"^  (\w+):", outputs, re.MULTILINE))
+
+    assert set(RESULT_KEYS.values()) <= declared
@@ -2,81 +2,155 @@
 Unit tests for role_checker module
 """
 
-import json
+import httpx
 import pytest
-from unittest.mock import patch, AsyncMock
 
 from src.role_checker import check_user_roles
 
+# Have httpx.AsyncClient return the shared mocked client in every test
+pytestmark = pytest.mark.usefixtures("patch_httpx_client")
 
-@pytest.mark.asyncio
-async def test_check_user_roles_with_matches(mock_httpx_client):
-    """Test check_user_roles when users with the specified role are found"""
 
-    # Users 1 and 3 have the Administrator role (0000000000AAAAA1)
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        results = await check_user_roles(
+class _ApiError(Exception):
+    """Error raised by the mocked API"""
+
+
+@pytest.mark.parametrize(
+    "role_id,count,emails",
+    [
+        # Users 1 and 3 have the Administrator role
+        (
+            "0000000000AAAAA1",
+            2,
+            {"john.doe@example.com", "bob.johnson@example.com"},
+        ),
+        # No users have this role
+        ("0000000000DDDDD4", 0, set()),
+    ],
+)
+async def test_check_user_roles(mock_httpx_client, role_id, count, emails):
+    """Test check_user_roles finds exactly the users with the specified role"""
+
+    results = await check_user_roles(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        role_id=role_id,
+        api_endpoint="https://api.sumologic.com/api",
+    )
+
+    users_with_role = results["users_with_role"]
+
+    # Check the count matches
+    assert results["users_count"] == count
+
+    # Check we have the expected users
+    assert {user["email"] for user in users_with_role} == emails
+
+    # Check role information is included; only the Administrator role has
+    # members in the mock data
+    for user in users_with_role:
+        assert user["role"]["id"] == role_id
+        assert user["role"]["name"] == "Administrator"
+
+
+async def test_check_user_roles_api_error(mock_httpx_client):
+    """Test check_user_roles when the API returns an error"""
+
+    # Mock httpx client to raise an exception
+    async def mock_get(url, *args, **kwargs):
+        raise _ApiError()
+
+    mock_httpx_client.handler = mock_get
+
+    with pytest.raises(_ApiError):
+        await check_user_roles(
             sumo_access_id="test_id",
             sumo_access_key="test_key",
             role_id="0000000000AAAAA1",
             api_endpoint="https://api.sumologic.com/api",
         )
 
-        # Parse the users_with_role JSON string to a list
-        users_with_role = json.loads(results["users_with_role"])
 
-        # Check the count matches
-        assert results["users_count"] == 2
+@pytest.mark.parametrize("status_code", [403, 500])
+async def test_check_user_roles_without_role_access(mock_httpx_client, status_code):
+    """Test check_user_roles still matches roleIds when the role cannot be read"""
 
-        # Check we have the expected users
-        assert len(users_with_role) == 2
+    handler = mock_httpx_client.handler
 
-        # Check user details
-        emails = [user["email"] for user in users_with_role]
-        assert "john.doe@example.com" in emails
-        assert "bob.johnson@example.com" in emails
+    async def mock_get(url, *args, **kwargs):
+        if "/roles/" in url:
+            return httpx.Response(status_code, request=httpx.Request("GET", url))
+        return await handler(url, *args, **kwargs)
 
-        # Check role information is included
-        for user in users_with_role:
-            assert user["role"]["id"] == "0000000000AAAAA1"
-            assert user["role"]["name"] == "Role 0000000000AAAAA1"
+    mock_httpx_client.handler = mock_get
 
+    results = await check_user_roles(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        role_id="0000000000AAAAA1",
+        api_endpoint="https://api.sumologic.com/api",
+    )
 
-@pytest.mark.asyncio
-async def test_check_user_roles_no_matches(mock_httpx_client):
-    """Test check_user_roles when no users with the specified role are found"""
+    # Users 1 and 3 carry the role in their roleIds; the name falls back
+    assert results["users_count"] == 2
+    for user in results["users_with_role"]:
+        assert user["role"]["name"] == "Role 0000000000AAAAA1"
 
-    # No users have role ID 0000000000DDDDD4
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        results = await check_user_roles(
-            sumo_access_id="test_id",
-            sumo_access_key="test_key",
-            role_id="0000000000DDDDD4",
-            api_endpoint="https://api.sumologic.com/api",
-        )
 
-        # Parse the users_with_role JSON string to a list
-        users_with_role = json.loads(results["users_with_role"])
+async def test_check_user_roles_with_shared_client(mock_httpx_client):
+    """Test check_user_roles reuses a client passed in by the caller"""
 
-        # Check the count matches
-        assert results["users_count"] == 0
+    results = await check_user_roles(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        role_id="0000000000AAAAA1",
+        api_endpoint="https://api.sumologic.com/api",
+        client=mock_httpx_client,
+    )
 
-        # Check we have no users
-        assert len(users_with_role) == 0
+    assert results["users_count"] == 2
 
+    # Check the shared client is left open for the caller
+    assert not mock_httpx_client.is_closed
 
-@pytest.mark.asyncio
-async def test_check_user_roles_api_error(mock_httpx_client):
-    """Test check_user_roles when the API returns an error"""
 
-    # Mock httpx client to raise an exception
-    mock_httpx_client.get = AsyncMock(side_effect=Exception("API Error"))
-
-    with patch("httpx.AsyncClient", return_value=mock_httpx_client):
-        with pytest.raises(Exception, match="API Error"):
-            await check_user_roles(
-                sumo_access_id="test_id",
-                sumo_access_key="test_key",
-                role_id="0000000000AAAAA1",
-                api_endpoint="https://api.sumologic.com/api",
-            )
+async def test_check_user_roles_from_role_membership(
+    mock_httpx_client_without_role_ids,
+):
+    """Test check_user_roles uses the role's members when users lack roleIds"""
+
+    results = await check_user_roles(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        role_id="0000000000AAAAA1",
+        api_endpoint="https://api.sumologic.com/api",
+    )
+
+    # Users 1 and 3 are members of the Administrator role
+    users_with_role = results["users_with_role"]
+    assert {user["email"] for user in users_with_role} == {
+        "john.doe@example.com",
+        "bob.johnson@example.com",
+    }
+
+    # Check only the users and the role were fetched
+    assert len(mock_httpx_client_without_role_ids.requests) == 2
+
+
+async def test_check_user_roles_per_user_fallback(
+    mock_httpx_client_without_role_ids,
+):
+    """Test check_user_roles checks each user's roles when the role is not found"""
+
+    results = await check_user_roles(
+        sumo_access_id="test_id",
+        sumo_access_key="test_key",
+        role_id="0000000000DDDDD4",
+        api_endpoint="https://api.sumologic.com/api",
+    )
+
+    # No users have role ID 0000000000DDDDD4
+    assert results["users_count"] == 0
+
+    # Check the users, the role and each of the three users were fetched
+    assert len(mock_httpx_client_without_role_ids.requests) == 5
@@ -0,0 +1,29 @@
+"""
+Unit tests for role_filter module
+"""
+
+from src.role_filter import filter_users_with_role, matches, member_ids_from_role_ids
+
+
+def test_matches_handles_missing_role_ids():
+    """Test matches treats a missing or null roleIds as no roles"""
+    wanted = frozenset(("0000000000AAAAA1",))
+
+    assert matches({"id": "1", "roleIds": ["0000000000AAAAA1"]}, wanted)
+    assert not matches({"id": "2", "roleIds": None}, wanted)
+    assert not matches({"id": "3"}, wanted)
+
+
+def test_filter_users_with_role(mock_users_data):
+    """Test filter_users_with_role builds entries for matching users only"""
+    users = mock_users_data["data"]
+    role_label = {"id": "0000000000AAAAA1", "name": "Administrator"}
+
+    member_ids = member_ids_from_role_ids(users, frozenset((role_label["id"],)))
+    users_with_role = filter_users_with_role(users, member_ids, role_label)
+
+    assert [user["email"] for user in users_with_role] == [
+        "john.doe@example.com",
+        "bob.johnson@example.com",
+    ]
+    assert all(user["role"] is role_label for user in users_with_role)
@@ -0,0 +1,92 @@
+"""
+Unit tests for the Sumo Logic client module
+"""
+
+import httpx
+import pytest
+
+from src.sumo_client import (
+    cached_get_items,
+    cached_get_json,
+    client_session,
+    parse_json,
+)
+
+
+async def test_client_session_closes_only_its_own_client():
+    """Test client_session closes a client it created but not a given one"""
+    async with client_session("test_id", "test_key") as client:
+        assert not client.is_closed
+    assert client.is_closed
+
+    shared_client = httpx.AsyncClient()
+    async with client_session("test_id", "test_key", shared_client) as client:
+        assert client is shared_client
+    assert not shared_client.is_closed
+    await shared_client.aclose()
+
+
+async def test_cached_get_json_reuses_parsed_response(mock_httpx_client):
+    """Test cached_get_json fetches a URL once until the cached response expires"""
+    url = "https://api.sumologic.com/api/v1/users"
+
+    users = await cached_get_json(mock_httpx_client, url)
+    assert await cached_get_json(mock_httpx_client, url) is users
+    assert len(mock_httpx_client.requests) == 1
+
+    # An expired response is fetched again
+    await cached_get_json(mock_httpx_client, url, ttl=0)
+    assert len(mock_httpx_client.requests) == 2
+
+
+@pytest.mark.parametrize("streamed", [True, False])
+async def test_cached_get_items_keeps_requested_fields(
+    mock_httpx_client, mock_users_data, monkeypatch, streamed
+):
+    """Test cached_get_items trims listing items, with and without ijson"""
+    if not streamed:
+        monkeypatch.setattr("src.sumo_client.ijson", None)
+    url = "https://api.sumologic.com/api/v1/users"
+
+    users = await cached_get_items(mock_httpx_client, url, ("id", "roleIds"))
+
+    assert users == [
+        {"id": user["id"], "roleIds": user["roleIds"]}
+        for user in mock_users_data["data"]
+    ]
+    assert await cached_get_items(mock_httpx_client, url, ("id", "roleIds")) is users
+    assert len(mock_httpx_client.requests) == 1
+
+
+@pytest.mark.parametrize("streamed", [True, False])
+async def test_cached_get_items_follows_pages(monkeypatch, streamed):
+    """Test cached_get_items collects the items of every page"""
+    if not streamed:
+        monkeypatch.setattr("src.sumo_client.ijson", None)
+    pages = {
+        None: {"data": [{"id": "1"}, {"id": "2"}], "next": "page2"},
+        "page2": {"next": "page3", "data": [{"id": "3"}]},
+        "page3": {"data": [{"id": "4"}], "next": None},
+    }
+    tokens = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.url.params.get("token")
+        tokens.append(token)
+        return httpx.Response(200, json=pages[token])
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        users = await cached_get_items(client, "https://example.com/users", ("id",))
+
+    assert users == [{"id": "1"}, {"id": "2"}, {"id": "3"}, {"id": "4"}]
+    assert tokens == [None, "page2", "page3"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_parse_json(monkeypatch, use_orjson):
+    """Test parse_json decodes the response body, with and without orjson"""
+    if not use_orjson:
+        monkeypatch.setattr("src.sumo_client.orjson", None)
+    response = httpx.Response(200, content=b'{"data":[{"id":"1","name":"\xc3\xa9"}]}')
+
+    assert parse_json(response) == {"data": [{"id": "1", "name": "é"}]}